@@ -1,10 +1,50 @@
 import streamlit as st
-import time
+import asyncio
+import re
 
-# Dummy function to simulate LLM model responses
-def get_model_response(model_name, prompt):
-    time.sleep(1)  # Simulate response time
-    return f"Response from {model_name} for prompt: '{prompt}'"
+def build_batch_prompt(prompts):
+    """Combine several prompts into one request with a heading per question."""
+    questions = "\n".join(f"### Question {i}\n{prompt}" for i, prompt in enumerate(prompts, 1))
+    return (
+        "Answer each question independently. Start each answer with a line "
+        "'### Answer N' matching its question number.\n\n" + questions
+    )
+
+def split_sections(text, label, count):
+    """Split text on '### <label> N' heading lines into `count` sections, by number."""
+    parts = re.split(rf"^### {label} (\d+)[ \t]*$", text, flags=re.M)
+    sections = [""] * count
+    for number, section in zip(parts[1::2], parts[2::2]):
+        index = int(number) - 1
+        if 0 <= index < count:
+            sections[index] = section.strip()
+    return sections
+
+def parse_batch_response(text, count):
+    """Split a batch answer back into one answer per prompt, or None if it has no answer headings."""
+    if not re.search(r"^### Answer \d+[ \t]*$", text, flags=re.M):
+        return None
+    return split_sections(text, "Answer", count)
+
+# Dummy function to simulate one LLM call
+async def call_model(model_name, batch_prompt):
+    await asyncio.sleep(1)  # Simulate response time
+    count = len(re.findall(r"^### Question \d+", batch_prompt, flags=re.M))
+    questions = split_sections(batch_prompt, "Question", count)
+    return "\n".join(
+        f"### Answer {i}\nResponse from {model_name} for prompt: '{question}'"
+        for i, question in enumerate(questions, 1)
+    )
+
+async def get_model_response(model_name, prompts):
+    """Send all prompts to one model in a single call; return its reply and the split answers."""
+    reply = await call_model(model_name, build_batch_prompt(prompts))
+    return reply, parse_batch_response(reply, len(prompts))
+
+async def get_all_responses(selected_models, prompts):
+    """Query all selected models concurrently instead of one after another."""
+    tasks = [get_model_response(model, prompts) for model in selected_models]
+    return await asyncio.gather(*tasks)
 
 # Main Streamlit application
 def main():
@@ -12,18 +52,24 @@ def main():
 
     models = ["GPT-3", "GPT-4", "BERT"]
     selected_models = st.multiselect("Select LLM Models", models)
-    prompt = st.text_input("Enter your prompt:")
-    
+    prompt_text = st.text_area("Enter your prompts (one per line):")
+    prompts = [line.strip() for line in prompt_text.splitlines() if line.strip()]
+
     if st.button("Compare"):
-        if selected_models and prompt:
-            outputs = {}
-            for model in selected_models:
-                outputs[model] = get_model_response(model, prompt)
-            
+        if selected_models and prompts:
+            responses = asyncio.run(get_all_responses(selected_models, prompts))
+            outputs = dict(zip(selected_models, responses))
+
             st.write("### Model Outputs")
-            for model, output in outputs.items():
-                st.write(f"**{model}:** {output}")
-            
+            for model, (reply, answers) in outputs.items():
+                st.write(f"**{model}:**")
+                if answers is None:
+                    st.warning(f"{model} did not use '### Answer N' headings; showing its full reply.")
+                    st.write(reply)
+                    continue
+                for prompt, output in zip(prompts, answers):
+                    st.write(f"- *{prompt}*: {output}")
+
             st.write("### Key Differences")
             st.write("Response time, accuracy, etc. will be displayed here.")
         else:
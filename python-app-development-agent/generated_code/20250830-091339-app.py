@@ -1,21 +1,97 @@
+import asyncio
+import threading
+
 import streamlit as st
-import openai
+import numpy as np
+
+# Prompts whose embeddings are at least this similar reuse a cached response
+SIMILARITY_THRESHOLD = 0.92
+# Shortened float16 embeddings keep the semantic cache small
+EMBEDDING_DIMENSIONS = 256
+
+@st.cache_resource
+def get_client():
+    """Create one async OpenAI client so its connection pool is reused across submits."""
+    # Imported here so page loads don't pay for openai until the first submit
+    from openai import AsyncOpenAI, DefaultAsyncHttpxClient
+
+    # Set your OpenAI API key
+    return AsyncOpenAI(api_key='YOUR_API_KEY', http_client=DefaultAsyncHttpxClient())
+
+@st.cache_resource
+def get_event_loop():
+    """Run a single background event loop that owns the client's connections."""
+    # asyncio.run() would open a new loop per submit, stranding pooled connections
+    loop = asyncio.new_event_loop()
+    threading.Thread(target=loop.run_forever, daemon=True).start()
+    return loop
+
+def run_async(coro):
+    """Run a coroutine on the shared event loop and wait for its result."""
+    return asyncio.run_coroutine_threadsafe(coro, get_event_loop()).result()
 
-# Set your OpenAI API key
-openai.api_key = 'YOUR_API_KEY'
+async def request_completion(client, prompt):
+    """Ask the chat model for a completion without blocking the event loop."""
+    response = await client.chat.completions.create(
+        model="gpt-3.5-turbo",
+        messages=[{"role": "user", "content": prompt}]
+    )
+    return response.choices[0].message.content
+
+async def request_embedding(client, text):
+    """Ask the embeddings endpoint for the vector of the given text."""
+    response = await client.embeddings.create(
+        model="text-embedding-3-small", input=text, dimensions=EMBEDDING_DIMENSIONS
+    )
+    return response.data[0].embedding
+
+@st.cache_data(ttl=24 * 60 * 60, show_spinner=False)
+def fetch_completion(prompt):
+    """Call the chat model; identical prompts are served from Streamlit's cache."""
+    return run_async(request_completion(get_client(), prompt))
+
+@st.cache_data(ttl=24 * 60 * 60, show_spinner=False)
+def get_embedding(text):
+    """Return a unit-length float16 embedding vector for the given text."""
+    vec = np.array(run_async(request_embedding(get_client(), text)), dtype=np.float32)
+    return (vec / np.linalg.norm(vec)).astype(np.float16)
+
+def find_similar_response(vec):
+    """Return the cached response of the most similar earlier prompt, if close enough."""
+    responses = st.session_state["responses"]
+    if not responses:
+        return None
+    scores = st.session_state["embeddings"] @ vec  # one similarity per cached prompt
+    best = int(np.argmax(scores))
+    if scores[best] > SIMILARITY_THRESHOLD:
+        return responses[best]
+    return None
 
 def get_gpt_response(prompt):
-    """Fetch response from OpenAI's GPT model."""
+    """Fetch response from OpenAI's GPT model, reusing answers to near-duplicate prompts."""
+    # The semantic cache is only an optimization: if embeddings fail, just ask the model
+    try:
+        vec = get_embedding(prompt)
+        cached = find_similar_response(vec)
+        if cached is not None:
+            return cached
+    except Exception:
+        vec = None
     try:
-        response = openai.ChatCompletion.create(
-            model="gpt-3.5-turbo",
-            messages=[{"role": "user", "content": prompt}]
-        )
-        return response.choices[0].message['content']
+        content = fetch_completion(prompt)
     except Exception as e:
         return f"Error: {str(e)}"
+    if vec is not None:
+        st.session_state["embeddings"] = np.vstack([st.session_state["embeddings"], vec])
+        st.session_state["responses"].append(content)
+    return content
 
 # Streamlit UI
+if "embeddings" not in st.session_state:
+    # Semantic cache: row i of the (N, D) embedding matrix belongs to responses[i]
+    st.session_state["embeddings"] = np.empty((0, EMBEDDING_DIMENSIONS), dtype=np.float16)
+    st.session_state["responses"] = []
+
 st.title("GPT Prompt Application")
 user_prompt = st.text_input("Enter your prompt:")
 if st.button("Submit"):
@@ -1,47 +1,89 @@
 import os
 import re
+import asyncio
+import functools
+import hashlib
+import json
 import time
 import pathlib
-from typing import List, Dict
+import shlex
+import subprocess
+import types
+from typing import List, Dict, Tuple
 
+import httpx
 from autogen import AssistantAgent, UserProxyAgent
-from autogen.agentchat.groupchat import GroupChat, GroupChatManager
+from autogen.io import IOConsole, IOStream
+
+try:
+    from orjson import dumps as _json_dumps
+except ImportError:  # orjson is optional; the stdlib writes the same compact JSON
+    def _json_dumps(obj) -> bytes:
+        return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+# Opening-fence language tag; shared by extract_code_block and CodeStreamWriter
+_FENCE_INFO = r"[a-zA-Z0-9_-]*"
+_FENCE_INFO_RE = re.compile(_FENCE_INFO)
+_CODE_FENCE_RE = re.compile(rf"```{_FENCE_INFO}\n(.*?)```", re.S)
 
 
 # ==============
 # CONFIG HELPERS
 # ==============
-def build_llm_config():
+class SharedHttpClient(httpx.Client):
+    """httpx.Client that survives Autogen's deepcopy of llm_config as the same object."""
+
+    def __deepcopy__(self, memo):
+        return self
+
+
+@functools.lru_cache(maxsize=None)
+def get_http_client() -> SharedHttpClient:
+    """
+    One keep-alive connection pool shared by every agent's OpenAI client,
+    so PM/Dev/QA calls reuse TCP/TLS connections instead of opening their own.
+    """
+    return SharedHttpClient(limits=httpx.Limits(max_keepalive_connections=32), timeout=30)
+
+
+@functools.lru_cache(maxsize=1)
+def build_llm_config() -> types.MappingProxyType:
     """
     Build a provider-agnostic llm_config for Autogen.
     Supports OpenAI (cloud) or Ollama (local, OpenAI-compatible).
+    The result is memoized. Only its top level is read-only: config_list and
+    its entries are shared, so copy before changing them (Autogen deep-copies
+    llm_config per agent). To pick up changed environment variables, call
+    reload_agents(); clearing this cache alone leaves built agents unchanged.
     """
     provider = os.getenv("MODEL_PROVIDER", "openai").lower()
 
     if provider == "ollama":
         base_url = os.getenv("OLLAMA_BASE_URL", "http://localhost:11434/v1")
         model = os.getenv("OLLAMA_MODEL", "llama3:8b")
-        return {
+        return types.MappingProxyType({
             "config_list": [
                 {
                     "model": model,
                     "api_key": os.getenv("OLLAMA_API_KEY", "ollama"),  # dummy
                     "base_url": base_url,
+                    "http_client": get_http_client(),
                 }
             ],
             "temperature": 0.2,
-        }
+        })
 
     # default: OpenAI
-    return {
+    return types.MappingProxyType({
         "config_list": [
             {
                 "model": os.getenv("OPENAI_MODEL", "gpt-4o-mini"),
                 "api_key": os.getenv("OPENAI_API_KEY"),
+                "http_client": get_http_client(),
             }
         ],
         "temperature": 0.2,
-    }
+    })
 
 
 # ======================
@@ -51,14 +93,25 @@ WORK_DIR = pathlib.Path("workspace")
 WORK_DIR.mkdir(exist_ok=True)
 TRANSCRIPTS_DIR = pathlib.Path("transcripts")
 TRANSCRIPTS_DIR.mkdir(exist_ok=True)
+TRANSCRIPT_INDEX = TRANSCRIPTS_DIR / "index.json"  # {content hash: transcript file name}
 GENERATED_DIR = pathlib.Path("generated_code")
 GENERATED_DIR.mkdir(exist_ok=True)
+_WORK_DIR_RESOLVED = WORK_DIR.resolve()  # resolved once; safe_path runs on every tool call
+
+if hasattr(pathlib.PurePath, "is_relative_to"):  # Python 3.9+
+    def _inside_work_dir(p: pathlib.Path) -> bool:
+        return p.is_relative_to(_WORK_DIR_RESOLVED)
+else:
+    _WORK_DIR_PREFIX = str(_WORK_DIR_RESOLVED) + os.sep
+
+    def _inside_work_dir(p: pathlib.Path) -> bool:
+        return p == _WORK_DIR_RESOLVED or str(p).startswith(_WORK_DIR_PREFIX)
 
 
 def safe_path(rel_path: str) -> pathlib.Path:
     """Prevent directory traversal; constrain all writes to WORK_DIR."""
     p = (WORK_DIR / rel_path).resolve()
-    if WORK_DIR.resolve() not in p.parents and p != WORK_DIR.resolve():
+    if not _inside_work_dir(p):
         raise ValueError("Unsafe path.")
     return p
 
@@ -72,25 +125,34 @@ def write_file_tool(filename: str = None, content: str = None) -> str:
         return "Error: Missing filename or content."
     path = safe_path(filename)
     path.parent.mkdir(parents=True, exist_ok=True)
-    path.write_text(content, encoding="utf-8")
+    path.write_bytes(content.encode("utf-8"))
     return f"Wrote file: {path}"
 
 
+ALLOWED_COMMAND_PREFIXES = ("echo ", "python ", "pytest", "ls", "cat ")
+_ALLOWED_COMMAND_RE = re.compile("|".join(map(re.escape, ALLOWED_COMMAND_PREFIXES)))
+
+
+@functools.lru_cache(maxsize=256)
+def _split(command: str) -> Tuple[str, ...]:
+    """Tokenize a shell command; agents often repeat the same ls/cat calls."""
+    return tuple(shlex.split(command))
+
+
 def run_shell_tool(command: str) -> str:
     """
     Minimal safe shell runner: only allows a tiny whitelist of commands.
     (Extend with care; this is intentionally restrictive.)
     """
-    import subprocess, shlex
-
-    allowed_prefixes = ("echo ", "python ", "pytest", "ls", "cat ")
-    if not any(command.startswith(p) for p in allowed_prefixes):
+    if not _ALLOWED_COMMAND_RE.match(command):
         return "Rejected: command not allowed by policy."
 
     try:
+        # No preexec_fn, so CPython can spawn via vfork instead of copying this process
         res = subprocess.run(
-            shlex.split(command),
+            _split(command),
             cwd=str(WORK_DIR),
+            stdin=subprocess.DEVNULL,  # never wait on the interactive terminal
             capture_output=True,
             text=True,
             timeout=30,
@@ -106,61 +168,61 @@ def run_shell_tool(command: str) -> str:
 # ======================
 # AGENT DEFINITIONS
 # ======================
-llm_config = build_llm_config()
-
-pm = AssistantAgent(
-    name="ProductManager",
-    system_message=(
-        "You are a pragmatic Product Manager. "
-        "Clarify requirements, break features into small deliverables, and hand off a concise spec to engineering. "
-        "Prefer crisp acceptance criteria and simple scope for an MVP."
-    ),
-    llm_config=llm_config,
-)
-
-dev = AssistantAgent(
-    name="Developer",
-    system_message=(
-        "You are a senior software engineer. "
-        "Write clean, minimal, production-friendly code. "
-        "Return code in a single fenced block with the intended filename in the first line as a comment, e.g. '# file: app.py'. "
-        "Do NOT call write_file yourself — the human will handle saving. "
-        "Add brief inline comments and avoid unnecessary dependencies."
-    ),
-    llm_config=llm_config,
-)
-
-qa = AssistantAgent(
-    name="QAEngineer",
-    system_message=(
-        "You are a quality engineer. "
-        "Review the spec and code, propose tests, and point out edge cases. "
-        "If tests are missing, suggest a minimal pytest test file. Keep feedback actionable."
-    ),
-    llm_config=llm_config,
-)
-
-# The Human proxy: prompts you at checkpoints.
-human = UserProxyAgent(
-    name="Human",
-    human_input_mode="ALWAYS",   # asks you for approval/inputs during the run
-    code_execution_config=False, # we’ll gate tools ourselves
-)
-
-
-# ==================================
-# REGISTER TOOLS
-# ==================================
-@human.register_for_execution()
-def tool_write_file(filename: str = None, content: str = None) -> str:
-    """Write content to a file under workspace/ (approved by human)."""
-    return write_file_tool(filename, content)
-
-
-@human.register_for_execution()
-def tool_run_shell(command: str) -> str:
-    """Run a limited shell command inside workspace/ (approved by human)."""
-    return run_shell_tool(command)
+@functools.lru_cache(maxsize=None)
+def get_agents() -> Dict[str, object]:
+    """
+    Build the agents once per process so the LLM config and HTTP pool are set up once.
+    run_team passes each reply its full context, so no chat history is kept here.
+    """
+    llm_config = dict(build_llm_config())  # Autogen requires a plain dict
+
+    pm = AssistantAgent(
+        name="ProductManager",
+        system_message=(
+            "You are a pragmatic Product Manager. "
+            "Clarify requirements, break features into small deliverables, and hand off a concise spec to engineering. "
+            "Prefer crisp acceptance criteria and simple scope for an MVP."
+        ),
+        llm_config=llm_config,
+    )
+
+    dev = AssistantAgent(
+        name="Developer",
+        system_message=(
+            "You are a senior software engineer. "
+            "Write clean, minimal, production-friendly code. "
+            "Return code in a single fenced block with the intended filename in the first line as a comment, e.g. '# file: app.py'. "
+            "Do NOT call write_file yourself — the human will handle saving. "
+            "Add brief inline comments and avoid unnecessary dependencies."
+        ),
+        llm_config={**llm_config, "stream": True},  # tokens feed CodeStreamWriter
+    )
+
+    qa = AssistantAgent(
+        name="QAEngineer",
+        system_message=(
+            "You are a quality engineer. "
+            "Review the spec and code, propose tests, and point out edge cases. "
+            "If tests are missing, suggest a minimal pytest test file. Keep feedback actionable."
+        ),
+        llm_config=llm_config,
+    )
+
+    # The Human proxy: every checkpoint and tool approval is asked through it.
+    human = UserProxyAgent(
+        name="Human",
+        human_input_mode="ALWAYS",   # asks you for approval/inputs during the run
+        code_execution_config=False, # we’ll gate tools ourselves
+    )
+
+    return {"pm": pm, "dev": dev, "qa": qa, "human": human}
+
+
+def reload_agents() -> Dict[str, object]:
+    """Re-read the environment and rebuild the agents with the new LLM config."""
+    build_llm_config.cache_clear()
+    get_agents.cache_clear()
+    return get_agents()
 
 
 # ======================
@@ -168,15 +230,15 @@ def tool_run_shell(command: str) -> str:
 # ======================
 def extract_code_block(text: str) -> Dict[str, str]:
     """Extract code block and filename if present."""
-    match = re.search(r"```[a-zA-Z0-9_-]*\n(.*?)```", text, flags=re.S)
+    match = _CODE_FENCE_RE.search(text)
     if not match:
         return {"code": ""}
     code = match.group(1)
-    first_line = code.splitlines()[0].strip() if code else ""
+    first_line, _, rest = code.partition("\n")
     filename = None
-    if first_line.lower().startswith("# file:"):
+    if first_line.strip().lower().startswith("# file:"):
         filename = first_line.split(":", 1)[1].strip()
-        code = "\n".join(code.splitlines()[1:])
+        code = rest  # keep the body byte-for-byte, as CodeStreamWriter writes it
     return {"filename": filename, "code": code}
 
 
@@ -187,66 +249,283 @@ def save_generated_code(parsed: Dict[str, str], agent_name="Developer") -> str:
     ts = time.strftime("%Y%m%d-%H%M%S")
     filename = parsed.get("filename") or "snippet.py"
     dest = GENERATED_DIR / f"{ts}-{filename}"
-    dest.write_text(parsed["code"], encoding="utf-8")
+    dest.write_bytes(parsed["code"].encode("utf-8"))
     return f"✅ Code saved for end users at {dest}"
 
 
-def save_transcript(messages: List[Dict]):
-    ts = time.strftime("%Y%m%d-%H%M%S")
-    path = TRANSCRIPTS_DIR / f"session-{ts}.md"
-    lines = []
-    for m in messages:
-        role = m.get("name") or m.get("role") or "unknown"
-        content = m.get("content", "")
-        lines.append(f"### {role}\n\n{content}\n\n---\n")
-    path.write_text("\n".join(lines), encoding="utf-8")
-    print(f"\n📒 Transcript saved to: {path}\n")
+class CodeStreamWriter:
+    """
+    Incrementally parse a streamed Developer reply and write its fenced code
+    block to generated_code/ while tokens are still arriving.
+    States: PRE_FENCE -> FILENAME_LINE -> BODY -> DONE.
+    Accepts the same blocks as extract_code_block and writes the same code.
+    """
+
+    def __init__(self):
+        self.last_path = None  # last block written completely
+        self._reset()
+
+    def _reset(self):
+        self.state = "PRE_FENCE"
+        self.buf = ""
+        self.file = None
+        self.path = None
+        self.empty = True  # nothing written to the block body yet
+
+    def _write(self, text: str):
+        if text:
+            self.empty = False
+            self.file.write(text.encode("utf-8"))
+
+    def feed(self, chunk: str):
+        self.buf += chunk
+        while self.state == "PRE_FENCE":
+            start = self.buf.find("```")
+            if start == -1:
+                self.buf = self.buf[-2:]  # keep a possible partial fence
+                return
+            newline = self.buf.find("\n", start)
+            if newline == -1:
+                self.buf = self.buf[start:]  # wait for the end of the fence line
+                return
+            if not _FENCE_INFO_RE.fullmatch(self.buf[start + 3:newline]):
+                # Not an opening fence here; like re.search, retry one character later
+                # (so "````python" still opens at its last three backticks)
+                self.buf = self.buf[start + 1:]
+                continue
+            self.buf = self.buf[newline + 1:]
+            self.state = "FILENAME_LINE"
+        if self.state == "FILENAME_LINE":
+            newline = self.buf.find("\n")
+            fence = self.buf.find("```")
+            if newline == -1 and fence == -1:
+                return
+            # The first line ends at a newline or at the closing fence, whichever comes first
+            ends_at_newline = newline != -1 and (fence == -1 or newline < fence)
+            line_end = newline if ends_at_newline else fence
+            first_line = self.buf[:line_end].strip()
+            filename = None
+            if first_line.lower().startswith("# file:"):
+                filename = first_line.split(":", 1)[1].strip()
+                self.buf = self.buf[line_end + 1:] if ends_at_newline else self.buf[line_end:]
+            ts = time.strftime("%Y%m%d-%H%M%S")
+            self.path = GENERATED_DIR / f"{ts}-{filename or 'snippet.py'}"
+            self.file = self.path.open("wb")  # bytes, so line endings stay LF like save_generated_code
+            self.state = "BODY"
+        if self.state == "BODY":
+            end = self.buf.find("```")
+            if end == -1:
+                self._write(self.buf[:-2])
+                self.buf = self.buf[-2:]  # keep a possible partial closing fence
+                return
+            self._write(self.buf[:end])
+            self.file.close()
+            self.file = None
+            if self.empty:  # extract_code_block reports "no code" for this block too
+                self.path.unlink()
+            else:
+                self.last_path = self.path
+            self.state = "DONE"
+        self.buf = ""
+
+    def finish(self):
+        """End of one streamed reply: drop an unterminated block and reset."""
+        if self.file is not None:
+            # extract_code_block ignores blocks without a closing fence, so do the same
+            self.file.close()
+            self.path.unlink(missing_ok=True)
+        self._reset()
+
+
+class DeveloperStreamIO(IOConsole):
+    """Console IOStream that also hands streamed tokens to a CodeStreamWriter."""
+
+    def __init__(self, writer: CodeStreamWriter):
+        self.writer = writer
+
+    def print(self, *objects, sep: str = " ", end: str = "\n", flush: bool = False):
+        super().print(*objects, sep=sep, end=end, flush=flush)
+        # Autogen prints streamed tokens with end="" and anything else normally
+        if end == "":
+            self.writer.feed(sep.join(map(str, objects)))
+        else:
+            self.writer.finish()
 
 
-def main():
-    print("\n=== Agentic MVP (fixed): PM → Dev → QA with Human approvals ===\n")
-    feature = input("Enter a small feature request (e.g., 'Build a CLI that reverses a string'): ")
+def transcript_rows(messages: List[Dict]) -> List[Tuple[str, str]]:
+    """Normalize chat messages to (role, content) rows once, right after the run."""
+    return [(m.get("name") or m.get("role") or "unknown", m.get("content") or "") for m in messages]
 
-    # Create a group chat so agents can coordinate
-    group = GroupChat(agents=[human, pm, dev, qa], messages=[], max_round=10)
-    manager = GroupChatManager(groupchat=group, llm_config=llm_config)
 
-    # Kick off
-    human.initiate_chat(
-        manager,
-        message=(
+def transcript_hash(rows: List[Tuple[str, str]]) -> str:
+    """Short BLAKE2b digest of the transcript content, used to spot repeated runs."""
+    digest = hashlib.blake2b(digest_size=8)
+    for role, content in rows:
+        digest.update(role.encode("utf-8") + b"\0" + content.encode("utf-8") + b"\0")
+    return digest.hexdigest()
+
+
+def save_transcript(rows: List[Tuple[str, str]]):
+    if not rows:
+        print("\n📒 No messages to save; transcript skipped.\n")
+        return
+    ts = time.strftime("%Y%m%d-%H%M%S")
+    h = transcript_hash(rows)
+    path = TRANSCRIPTS_DIR / f"session-{ts}-{h}.md"
+    jsonl_path = path.with_suffix(".jsonl")
+
+    try:
+        index = json.loads(TRANSCRIPT_INDEX.read_text(encoding="utf-8"))
+    except (OSError, ValueError):  # missing or corrupt index: start a fresh one
+        index = {}
+    if not isinstance(index, dict):
+        index = {}
+    name = index.get(h)
+    existing = TRANSCRIPTS_DIR / name if isinstance(name, str) and name else None  # bad entry: treat as missing
+    if existing and existing.exists() and existing.with_suffix(".jsonl").exists():
+        # Identical transcript already on disk: hard-link it instead of writing a copy
+        try:
+            if existing != path:
+                os.link(existing, path)
+                os.link(existing.with_suffix(".jsonl"), jsonl_path)
+            print(f"\n📒 Transcript unchanged; linked {path} to {existing}\n")
+            return
+        except OSError:  # e.g. no hard-link support; fall back to writing the files
+            path.unlink(missing_ok=True)
+            jsonl_path.unlink(missing_ok=True)
+
+    # Write each message as it is formatted instead of joining the whole transcript in memory
+    with path.open("w", encoding="utf-8", buffering=1 << 20) as f:
+        f.writelines(f"### {role}\n\n{content}\n\n---\n\n" for role, content in rows)
+    # Same messages as JSON Lines for tools that reprocess transcripts
+    with jsonl_path.open("wb", buffering=1 << 20) as f:
+        f.writelines(_json_dumps({"role": role, "content": content}) + b"\n" for role, content in rows)
+    index[h] = path.name
+    # Write a temp file and swap it in so a crash never leaves a truncated index
+    tmp_index = TRANSCRIPT_INDEX.with_suffix(".json.tmp")
+    tmp_index.write_text(json.dumps(index, indent=2), encoding="utf-8")
+    os.replace(tmp_index, TRANSCRIPT_INDEX)
+    print(f"\n📒 Transcript saved to: {path} (JSON Lines: {jsonl_path})\n")
+
+
+def _reply_text(reply) -> str:
+    """Normalize an Autogen reply (str, dict or None) to its text content."""
+    if isinstance(reply, dict):
+        return reply.get("content") or ""
+    return reply or ""
+
+
+async def _stream_dev_reply(dev: AssistantAgent, messages: List[Dict], writer: CodeStreamWriter):
+    """
+    Generate Dev's reply with its streamed tokens going to the writer.
+    The IOStream override lives in this task's context only, so agents running
+    concurrently keep printing to the console.
+    """
+    with IOStream.set_default(DeveloperStreamIO(writer)):
+        try:
+            return await dev.a_generate_reply(messages=messages)
+        finally:
+            writer.finish()
+
+
+async def run_team(agents: Dict[str, object], feature: str, writer: CodeStreamWriter) -> List[Dict]:
+    """
+    Run PM → Dev → QA → Dev and return the messages in chat order.
+    Dev's implementation and QA's spec review both depend only on the spec,
+    so they run concurrently; QA then reviews the finished code and Dev
+    revises it once in response.
+    """
+    request = {
+        "role": "user",
+        "name": "Human",
+        "content": (
             "You are a cross-functional team. "
             "PM: refine requirements and pass a concise spec to Dev. "
             "Dev: propose minimal code with a single file and tests. "
             "QA: review and suggest improvements.\n\n"
             f"Feature request: {feature}\n"
-            "Follow the order PM → Dev → QA."
         ),
+    }
+    spec = {
+        "role": "user",
+        "name": "ProductManager",
+        "content": _reply_text(await agents["pm"].a_generate_reply(messages=[request])),
+    }
+    print(f"\n--- ProductManager spec ---\n{spec['content']}\n")
+    notes = agents["human"].get_human_input("Press Enter to hand the spec to Dev and QA, or type changes: ").strip()
+    if notes:
+        spec["content"] += f"\n\nHuman notes: {notes}"
+
+    code_reply, spec_review_reply = await asyncio.gather(
+        _stream_dev_reply(agents["dev"], [request, spec], writer),
+        agents["qa"].a_generate_reply(messages=[request, spec]),
     )
+    code = {"role": "user", "name": "Developer", "content": _reply_text(code_reply)}
+    spec_review = {"role": "user", "name": "QAEngineer", "content": _reply_text(spec_review_reply)}
+    print(f"\n--- QAEngineer spec review ---\n{spec_review['content']}\n")
+    messages = [request, spec, spec_review, code]
+    notes = agents["human"].get_human_input("Press Enter to send the code to QA review, or type notes for QA: ").strip()
+    if notes:
+        messages.append({"role": "user", "name": "Human", "content": notes})
+
+    code_review = {
+        "role": "user",
+        "name": "QAEngineer",
+        "content": _reply_text(await agents["qa"].a_generate_reply(messages=messages)),
+    }
+    print(f"\n--- QAEngineer review ---\n{code_review['content']}\n")
+    messages.append(code_review)
+    notes = agents["human"].get_human_input("Press Enter to send the review to Dev for a revision, or type notes for Dev: ").strip()
+    if notes:
+        messages.append({"role": "user", "name": "Human", "content": notes})
 
-    # After the group run, get Developer output
-    dev_msgs = [m for m in group.messages if (m.get("name") or "").lower() == "developer"]
-    code_text = dev_msgs[-1]["content"] if dev_msgs else ""
-    parsed = extract_code_block(code_text)
+    revision_reply = await _stream_dev_reply(agents["dev"], messages, writer)
+    return messages + [{"role": "user", "name": "Developer", "content": _reply_text(revision_reply)}]
 
-    # Always save for end-users
-    msg = save_generated_code(parsed)
-    print(msg)
+
+def main():
+    print("\n=== Agentic MVP (fixed): PM → Dev → QA with Human approvals ===\n")
+    feature = input("Enter a small feature request (e.g., 'Build a CLI that reverses a string'): ")
+
+    agents = get_agents()
+
+    # Kick off; Developer code is written to generated_code/ as it streams
+    writer = CodeStreamWriter()
+    messages = asyncio.run(run_team(agents, feature, writer))
+
+    # After the run, get Developer output
+    rows = transcript_rows(messages)
+    # The revision wins unless it came back without a code block
+    dev_blocks = [extract_code_block(content) for role, content in rows if role.lower() == "developer"]
+    dev_blocks = [block for block in dev_blocks if block.get("code")]
+    parsed = dev_blocks[-1] if dev_blocks else {"code": ""}
+
+    # Always save for end-users (already done if the code block was streamed)
+    if writer.last_path:
+        print(f"✅ Code saved for end users at {writer.last_path}")
+    else:
+        print(save_generated_code(parsed))
 
     # Human approval for workspace write
+    human = agents["human"]
     if parsed.get("code"):
         filename = parsed.get("filename") or "app.py"
         print(f"\nDeveloper proposed file: {filename}")
         print("Preview (first 20 lines):")
         print("\n".join(parsed["code"].splitlines()[:20]))
-        if input("\nApprove writing this file to workspace/? (y/n): ").strip().lower() == "y":
+        if human.get_human_input("\nApprove writing this file to workspace/? (y/n): ").strip().lower() == "y":
             result = write_file_tool(filename, parsed["code"])
             print(result)
         else:
             print("Skipped writing file to workspace.")
 
+    # Optionally run a QA command inside workspace/ (e.g., 'pytest' or 'python app.py')
+    cmd = human.get_human_input("\nCommand to run in workspace/ (echo/python/pytest/ls/cat; Enter to skip): ").strip()
+    if cmd:
+        print(run_shell_tool(cmd))
+
     # Save transcript
-    save_transcript(group.messages)
+    save_transcript(rows)
     print("Done.\n")
 
 